@@ -5,7 +5,8 @@ A Python SDK for storing and searching visual memories using semantic embeddings
 """
 
 from .client import ErisedClient, AsyncErisedClient
+from .semantic_cache import SemanticCache
 
 __version__ = "0.1.0"
-__all__ = ["ErisedClient", "AsyncErisedClient"]
+__all__ = ["ErisedClient", "AsyncErisedClient", "SemanticCache"]
 
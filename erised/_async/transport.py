@@ -0,0 +1,68 @@
+"""
+AsyncRetryTransport - retries rate-limited and failed requests with backoff.
+"""
+
+import anyio
+import httpx
+
+from .._utils import (
+    IDEMPOTENT_METHODS,
+    RETRY_STATUS_CODES,
+    UNPROCESSED_STATUS_CODES,
+    is_replayable,
+    retry_delay,
+)
+
+
+class AsyncRetryTransport(httpx.AsyncHTTPTransport):
+    """
+    HTTP transport that retries 429 and 5xx responses with jittered exponential backoff.
+
+    Connection failures are retried by httpx itself via the retries argument.
+    Non-idempotent requests (POST) are only retried on 429 and 503, since after
+    a 500, 502 or 504 the server may already have acted on them.
+    Requests whose body cannot be replayed (e.g. a non-seekable upload stream)
+    are never retried; the first response is returned as-is.
+
+    Args:
+        max_retries: Maximum number of retries after the first attempt.
+        backoff_base: Delay in seconds before the first retry; doubles each attempt.
+        backoff_cap: Maximum delay in seconds between attempts.
+        **kwargs: Passed through to httpx.AsyncHTTPTransport (e.g. http2, limits).
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        **kwargs,
+    ):
+        kwargs.setdefault("retries", max_retries)
+        super().__init__(**kwargs)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        replayable = is_replayable(request)
+        if request.method in IDEMPOTENT_METHODS:
+            retry_status_codes = RETRY_STATUS_CODES
+        else:
+            retry_status_codes = UNPROCESSED_STATUS_CODES
+        while True:
+            response = await super().handle_async_request(request)
+            if (
+                response.status_code not in retry_status_codes
+                or attempt >= self.max_retries
+                or not replayable
+            ):
+                return response
+
+            delay = retry_delay(
+                response.headers.get("Retry-After"), attempt, self.backoff_base, self.backoff_cap
+            )
+            await response.aclose()
+            await anyio.sleep(delay)
+            attempt += 1
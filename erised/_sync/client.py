@@ -0,0 +1,594 @@
+# Generated from erised/_async/client.py by scripts/unasync.py. Do not edit.
+
+"""
+ErisedClient implementation.
+
+Usage:
+    from erised import ErisedClient
+
+    with ErisedClient(api_key="your-api-key") as client:
+        result = client.add(image="path/to/screenshot.png", user_id="user123")
+        results = client.search("code editor", user_id="user123")
+"""
+
+import os
+import json
+import httpx
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterator, Iterable, List, Optional, Union, BinaryIO
+
+from ..semantic_cache import SemanticCache
+from .._utils import (
+    DEFAULT_API_URL,
+    HEALTH_PATH,
+    MEMORIES_ADD_PATH,
+    MEMORIES_BATCH_ADD_PATH,
+    MEMORIES_PATH,
+    MEMORIES_SEARCH_PATH,
+    MISSING_ENDPOINT_STATUS_CODES,
+    ResponseCache,
+    gather_bounded,
+    load_file,
+    run_blocking,
+    check_max_concurrency,
+    check_request_compression,
+    client_identity,
+    dumps,
+    image_content_type,
+    image_digest,
+    image_source,
+    json_body,
+    proxy_urls,
+)
+from .transport import RetryTransport
+
+
+class ErisedClient:
+    """
+    Client for interacting with the Erised Visual Memory API.
+
+    Args:
+        api_key: Your Erised API key. If not provided, reads from ERISED_API_KEY env var.
+        api_url: Base URL for the API. Defaults to the Erised API endpoint.
+        timeout: Request timeout in seconds. Defaults to 120 (model inference can be slow).
+        max_connections: Maximum number of concurrent connections in the pool.
+        max_keepalive: Maximum number of idle keep-alive connections to retain.
+        max_retries: Retries for rate-limited (429) and 5xx responses and failed
+            connections, with jittered exponential backoff. POST requests (add,
+            search) are only retried on 429 and 503. Set to 0 to disable.
+        cache_size: Number of search/get responses to keep in an in-process LRU
+            cache. Set to 0 to disable caching.
+        cache_ttl: Seconds a cached response stays valid. Adding or deleting a
+            memory through this client invalidates the cache immediately.
+        dedup_cache_size: Number of uploaded image hashes to remember. Adding the
+            same image for the same user and metadata again returns the earlier
+            memory_id without uploading. Set to 0 to disable.
+        semantic_cache: Optional SemanticCache that reuses search results for
+            near-duplicate queries (e.g. "code editor" and "a code editor").
+        request_compression: Compress large JSON request bodies with "gzip" or
+            "zstd" (requires zstandard). Only enable this if the API endpoint
+            accepts compressed requests.
+        proxy: Proxy URL for all requests. Defaults to the HTTP_PROXY,
+            HTTPS_PROXY, ALL_PROXY and NO_PROXY environment variables.
+
+    Connections are pooled and multiplexed over HTTP/2, so reuse a single client
+    and call close() (or use it as a context manager) when you are done with it.
+
+    Usage:
+        with ErisedClient(api_key="your-key") as client:
+            results = client.search("code editor", user_id="user123")
+    """
+
+    __slots__ = (
+        "api_key",
+        "api_url",
+        "timeout",
+        "_cache",
+        "_dedup",
+        "_semantic_cache",
+        "_identity",
+        "_has_image_endpoint",
+        "_has_batch_endpoint",
+        "_request_compression",
+        "_client",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        timeout: float = 120.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        max_retries: int = 3,
+        cache_size: int = 128,
+        cache_ttl: float = 60.0,
+        dedup_cache_size: int = 1024,
+        semantic_cache: Optional[SemanticCache] = None,
+        request_compression: Optional[str] = None,
+        proxy: Optional[str] = None,
+    ):
+        self.api_key = api_key or os.environ.get("ERISED_API_KEY")
+        if not self.api_key:
+            raise ValueError(
+                "API key required. Pass api_key parameter or set ERISED_API_KEY environment variable."
+            )
+
+        self.api_url = (api_url or os.environ.get("ERISED_API_URL", DEFAULT_API_URL)).rstrip("/")
+        self.timeout = timeout
+        self._cache = ResponseCache(cache_size, cache_ttl)
+        self._dedup = ResponseCache(dedup_cache_size, float("inf"))
+        self._semantic_cache = semantic_cache
+        self._identity = client_identity(self.api_url, self.api_key)
+        # Cleared once the server is found not to serve /v1/memories/{id}/image
+        # or /v1/memories/batch_add respectively
+        self._has_image_endpoint = True
+        self._has_batch_endpoint = True
+        check_request_compression(request_compression)
+        self._request_compression = request_compression
+
+        def transport(proxy_url: Optional[str] = None) -> RetryTransport:
+            return RetryTransport(
+                max_retries=max_retries,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=30.0,
+                ),
+                http2=True,
+                proxy=httpx.Proxy(proxy_url) if proxy_url else None,
+            )
+
+        # httpx ignores proxy environment variables once a custom transport is
+        # passed, so proxied routes are mounted explicitly (with retries too)
+        self._client = httpx.Client(
+            base_url=self.api_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "User-Agent": "erised-python/0.1.0",
+            },
+            timeout=timeout,
+            transport=transport(),
+            mounts={
+                pattern: transport(url) if url else None
+                for pattern, url in proxy_urls(proxy).items()
+            },
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the HTTP client."""
+        self._client.close()
+
+    def cache_clear(self):
+        """Drop all cached search and get responses."""
+        self._cache.clear()
+        if self._semantic_cache is not None:
+            self._semantic_cache.discard(self._identity)
+
+    def _invalidate_caches(self):
+        """Forget cached responses after this client added or deleted memories."""
+        self._cache.invalidate()
+        if self._semantic_cache is not None:
+            self._semantic_cache.discard(self._identity)
+
+    def add(
+        self,
+        image: Union[str, Path, bytes, BinaryIO],
+        user_id: str,
+        metadata: Optional[dict] = None,
+        memory_id: Optional[str] = None,
+        force: bool = False,
+    ) -> dict:
+        """
+        Add an image to visual memory.
+
+        Args:
+            image: Image to store. Can be:
+                - Path to image file (str or Path)
+                - Raw image bytes
+                - File-like object with read() method
+            user_id: User identifier for memory isolation
+            metadata: Optional metadata to store with the memory
+            memory_id: Optional custom ID for the memory (auto-generated if not provided)
+            force: Upload even if this client already added an identical image
+                for the same user and metadata
+
+        Returns:
+            dict with memory_id and confirmation message, or memory_id and
+            deduped=True if an identical earlier upload was reused
+
+        Example:
+            >>> result = client.add("screenshot.png", user_id="user123")
+            >>> print(result["memory_id"])
+        """
+        filename, image_data = image_source(image)
+
+        with ExitStack() as stack:
+            # Large files and streams are handed to httpx as file objects so the
+            # upload is read in chunks instead of buffered whole.
+            if isinstance(image_data, Path):
+                image_data = load_file(image_data, stack)
+
+            dedup_key = None
+            if not force and not memory_id and self._dedup.maxsize:
+                digest = run_blocking(image_digest, image_data)
+                if digest is not None:
+                    dedup_key = self._dedup.key(user_id, metadata, digest.hex())
+                    existing = self._dedup.get(dedup_key)
+                    if existing is not None:
+                        return {"memory_id": existing, "deduped": True}
+
+            # Build multipart form data
+            files = {"file": (filename, image_data, image_content_type(image_data))}
+            data = {"user_id": user_id}
+
+            if metadata:
+                data["metadata"] = dumps(metadata).decode()
+
+            if memory_id:
+                data["memory_id"] = memory_id
+
+            response = self._client.post(MEMORIES_ADD_PATH, files=files, data=data)
+        response.raise_for_status()
+        self._invalidate_caches()
+        result = response.json()
+        if dedup_key is not None and result.get("memory_id"):
+            self._dedup.set(dedup_key, result["memory_id"])
+        return result
+
+    def add_many(
+        self,
+        images: List[Union[str, Path, bytes, BinaryIO]],
+        user_id: str,
+        metadatas: Optional[List[Optional[dict]]] = None,
+        batch_size: int = 32,
+        max_concurrency: int = 4,
+    ) -> List[dict]:
+        """
+        Add several images to visual memory, uploading batches concurrently.
+
+        Each batch is sent as one multipart request to /v1/memories/batch_add.
+        On servers without that endpoint the images are added one at a time.
+
+        Args:
+            images: Images to store, in any form accepted by add()
+            user_id: User identifier for memory isolation
+            metadatas: Optional list of metadata dicts, one per image
+            batch_size: Maximum number of images per request
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            List of add results (memory_id and message) in the same order as images
+
+        Example:
+            >>> paths = sorted(Path("screenshots").glob("*.png"))
+            >>> results = client.add_many(paths, user_id="user123")
+        """
+        if metadatas is not None and len(metadatas) != len(images):
+            raise ValueError("metadatas must have the same length as images")
+        check_max_concurrency(max_concurrency)
+
+        batches = [
+            (
+                images[start:start + batch_size],
+                metadatas[start:start + batch_size] if metadatas is not None else None,
+            )
+            for start in range(0, len(images), batch_size)
+        ]
+
+        def add_batch(batch):
+            return self._add_batch(*batch, user_id)
+
+        # The first batch goes alone so a server without the batch endpoint is
+        # detected before several full batches are uploaded in parallel
+        batch_results = [add_batch(batches[0])] if batches else []
+        batch_results += gather_bounded(add_batch, batches[1:], max_concurrency)
+
+        # Batches the server did not accept as a batch are added one image at a
+        # time, drawing on the same concurrency budget as the batch uploads
+        singles = [
+            (image, metadata)
+            for (batch_images, batch_metadatas), result in zip(batches, batch_results)
+            if result is None
+            for image, metadata in zip(batch_images, batch_metadatas or [None] * len(batch_images))
+        ]
+
+        def add_one(item):
+            return self.add(item[0], user_id, item[1])
+
+        single_results = iter(gather_bounded(add_one, singles, max_concurrency))
+
+        results = []
+        for (batch_images, _), result in zip(batches, batch_results):
+            if result is None:
+                result = [next(single_results) for _ in batch_images]
+            results.extend(result)
+        return results
+
+    def _add_batch(
+        self,
+        images: List[Union[str, Path, bytes, BinaryIO]],
+        metadatas: Optional[List[Optional[dict]]],
+        user_id: str,
+    ) -> Optional[List[dict]]:
+        """Upload one batch, or return None if the server has no batch endpoint."""
+        if not self._has_batch_endpoint:
+            return None
+
+        with ExitStack() as stack:
+            files = []
+            for image in images:
+                filename, image_data = image_source(image)
+                if isinstance(image_data, Path):
+                    image_data = load_file(image_data, stack)
+                files.append(("file", (filename, image_data, image_content_type(image_data))))
+
+            data = {"user_id": user_id}
+            if metadatas is not None:
+                data["metadatas"] = dumps(metadatas).decode()
+
+            response = self._client.post(MEMORIES_BATCH_ADD_PATH, files=files, data=data)
+
+        if response.status_code in MISSING_ENDPOINT_STATUS_CODES:
+            self._has_batch_endpoint = False
+            return None
+
+        response.raise_for_status()
+        self._invalidate_caches()
+        return response.json()["results"]
+
+    def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+        top_k: int = 10,
+        score_threshold: Optional[float] = None,
+    ) -> dict:
+        """
+        Search visual memories by text query.
+
+        Args:
+            query: Natural language search query
+            user_id: Filter by user ID (can also be in filters)
+            filters: Additional filters (e.g., {"user_id": "user123"})
+            top_k: Maximum number of results to return
+            score_threshold: Minimum similarity score (optional)
+
+        Returns:
+            dict with "results" list containing matching memories
+
+        Example:
+            >>> results = client.search("code editor", user_id="user123")
+            >>> for r in results["results"]:
+            ...     print(f"{r['memory_id']}: {r['score']}")
+        """
+        payload = {
+            "query": query,
+            "top_k": top_k,
+        }
+
+        # Handle filters
+        if filters is None:
+            filters = {}
+        if user_id:
+            filters["user_id"] = user_id
+        if filters:
+            payload["filters"] = filters
+
+        if score_threshold is not None:
+            payload["score_threshold"] = score_threshold
+
+        cache_key = self._cache.key("search", payload)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+        # Near-duplicate queries with the same filters, top_k and threshold can
+        # share results. Entries are owned by this client's URL and key, so a
+        # shared SemanticCache never mixes tenants, and writes discard them.
+        embedding = None
+        if self._semantic_cache is not None:
+            scope = self._cache.key("search", {k: v for k, v in payload.items() if k != "query"})
+            embedding = run_blocking(self._semantic_cache.embed, query)
+            cached = self._semantic_cache.lookup(embedding, scope, self._identity)
+            if cached is not None:
+                return json.loads(cached)
+
+        content, headers = json_body(payload, self._request_compression)
+        response = self._client.post(MEMORIES_SEARCH_PATH, content=content, headers=headers)
+        response.raise_for_status()
+        # Caches hold the raw body and decode it per hit, so callers can freely
+        # mutate what they get back
+        self._cache.set(cache_key, response.content)
+        if embedding is not None:
+            self._semantic_cache.store(embedding, scope, response.content, self._identity)
+        return response.json()
+
+    def get(self, memory_id: str) -> dict:
+        """
+        Get a specific memory by ID.
+
+        Args:
+            memory_id: The memory ID to retrieve
+
+        Returns:
+            Memory object with metadata including image_url
+        """
+        cache_key = self._cache.key("get", memory_id)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+        response = self._client.get(f"{MEMORIES_PATH}/{memory_id}")
+        response.raise_for_status()
+        self._cache.set(cache_key, response.content)
+        return response.json()
+
+    def get_many(self, memory_ids: Iterable[str], max_concurrency: int = 10) -> List[dict]:
+        """
+        Get several memories concurrently.
+
+        Requests are multiplexed over the client's connection pool, so keep
+        max_concurrency at or below max_connections.
+
+        Args:
+            memory_ids: The memory IDs to retrieve
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            Memory objects in the same order as memory_ids
+
+        Example:
+            >>> ids = [r["memory_id"] for r in results["results"]]
+            >>> memories = client.get_many(ids)
+        """
+        return gather_bounded(self.get, memory_ids, max_concurrency)
+
+    def get_images(self, memory_ids: Iterable[str], max_concurrency: int = 10) -> List[bytes]:
+        """
+        Get the image bytes for several memories concurrently.
+
+        Args:
+            memory_ids: The memory IDs to retrieve images for
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            Image bytes in the same order as memory_ids
+        """
+        return gather_bounded(self.get_image, memory_ids, max_concurrency)
+
+    def get_image(self, memory_id: str) -> bytes:
+        """
+        Get the image bytes for a specific memory.
+
+        Args:
+            memory_id: The memory ID to retrieve the image for
+
+        Returns:
+            Image bytes that can be written to file or used with PIL
+
+        Example:
+            >>> image_bytes = client.get_image("abc-123")
+            >>> with open("output.png", "wb") as f:
+            ...     f.write(image_bytes)
+        """
+        return b"".join([chunk for chunk in self.iter_image(memory_id, chunk_size=None)])
+
+    def iter_image(self, memory_id: str, chunk_size: Optional[int] = 65536) -> Iterator[bytes]:
+        """
+        Stream the image bytes for a specific memory.
+
+        Fetches the image in a single request from /v1/memories/{id}/image,
+        falling back to looking up image_url first on servers without that endpoint.
+
+        Args:
+            memory_id: The memory ID to retrieve the image for
+            chunk_size: Size of yielded chunks (None yields data as it arrives)
+
+        Yields:
+            Chunks of image bytes
+
+        Example:
+            >>> with open("output.png", "wb") as f:
+            ...     for chunk in client.iter_image("abc-123"):
+            ...         f.write(chunk)
+        """
+        if self._has_image_endpoint:
+            with self._client.stream("GET", f"{MEMORIES_PATH}/{memory_id}/image") as response:
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    for chunk in response.iter_bytes(chunk_size):
+                        yield chunk
+                    return
+
+        # The memory exists (get() raises otherwise), so the 404 came from the endpoint
+        image_url = self._get_image_path(memory_id)
+        self._has_image_endpoint = False
+
+        with self._client.stream("GET", image_url) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes(chunk_size):
+                yield chunk
+
+    def get_image_url(self, memory_id: str) -> str:
+        """
+        Get the full image URL for a specific memory.
+
+        Args:
+            memory_id: The memory ID
+
+        Returns:
+            Full URL to the image (requires auth header to access)
+        """
+        return f"{self.api_url}{self._get_image_path(memory_id)}"
+
+    def _get_image_path(self, memory_id: str) -> str:
+        memory = self.get(memory_id)
+        image_url = memory.get("image_url")
+        if not image_url:
+            raise ValueError(f"No image_url found for memory {memory_id}")
+        return image_url
+
+    def list(
+        self,
+        user_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> dict:
+        """
+        List memories, optionally filtered by user.
+
+        Args:
+            user_id: Filter by user ID
+            filters: Additional filters
+            limit: Maximum results to return
+            offset: Pagination offset
+
+        Returns:
+            dict with "memories" list and pagination info
+        """
+        params = {"limit": limit, "offset": offset}
+
+        if user_id:
+            params["user_id"] = user_id
+
+        response = self._client.get(MEMORIES_PATH, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def delete(self, memory_id: str) -> dict:
+        """
+        Delete a memory by ID.
+
+        Args:
+            memory_id: The memory ID to delete
+
+        Returns:
+            Confirmation message
+        """
+        response = self._client.delete(f"{MEMORIES_PATH}/{memory_id}")
+        response.raise_for_status()
+        self._invalidate_caches()
+        self._dedup.discard_value(memory_id)
+        return response.json()
+
+    def health(self) -> dict:
+        """
+        Check API health status.
+
+        Returns:
+            Health status information
+        """
+        response = self._client.get(HEALTH_PATH)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,470 @@
+"""
+Helpers shared by the async and sync Erised clients.
+
+Async/sync pairs (e.g. agather_bounded/gather_bounded) are named so that
+scripts/unasync.py can translate erised/_async into erised/_sync.
+"""
+
+import os
+import gzip
+import json
+import time
+import random
+import hashlib
+import ipaddress
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import getproxies
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union, BinaryIO
+
+import anyio
+import anyio.to_thread
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Default API endpoint
+DEFAULT_API_URL = "https://viraat--erised-erisedapi-serve.modal.run"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Request bodies smaller than this are sent uncompressed; the savings would not
+# cover the extra CPU on either end
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSED_JSON_HEADERS = {
+    encoding: {**JSON_HEADERS, "Content-Encoding": encoding}
+    for encoding in ("gzip", "zstd")
+}
+
+# API paths, built once rather than on every request
+MEMORIES_PATH = "/v1/memories"
+MEMORIES_ADD_PATH = MEMORIES_PATH + "/add"
+MEMORIES_BATCH_ADD_PATH = MEMORIES_PATH + "/batch_add"
+MEMORIES_SEARCH_PATH = MEMORIES_PATH + "/search"
+HEALTH_PATH = "/health"
+
+# Files larger than this are streamed from disk instead of read into memory
+STREAM_THRESHOLD = 1024 * 1024
+
+# Largest buffer used when hashing streams for upload deduplication
+HASH_BUFFER_SIZE = 256 * 1024
+
+# Responses meaning the server has no such endpoint: unknown path, a path
+# matching /v1/memories/{memory_id} that only allows GET/DELETE, or unimplemented
+MISSING_ENDPOINT_STATUS_CODES = frozenset({404, 405, 501})
+
+# Rate limiting and transient server errors (e.g. Modal cold starts)
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Responses to requests the server did not act on, so even a non-idempotent
+# request (e.g. an add that would create a second memory) is safe to resend
+UNPROCESSED_STATUS_CODES = frozenset({429, 503})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize obj to compact JSON bytes, using orjson when it is installed.
+
+    Anything orjson rejects but the json module accepts (non-str dict keys,
+    integers wider than 64 bits, ...) falls back to the json module, so the
+    optional dependency never changes which inputs work.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":")).encode()
+
+
+def retry_delay(retry_after: Optional[str], attempt: int, base: float, cap: float) -> float:
+    """
+    Seconds to wait before retry number attempt (0-based).
+
+    Honors a Retry-After header (seconds or HTTP date) when present, otherwise
+    uses exponential backoff with +/-50% jitter. Never exceeds cap.
+    """
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        try:
+            return min(cap, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            pass
+    return min(cap, base * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def is_replayable(request: httpx.Request) -> bool:
+    """
+    Whether a request's body can be sent again.
+
+    True for in-memory bodies and for multipart bodies whose files are all
+    seekable (httpx rewinds them when re-rendering). Anything else would be
+    re-sent partially or empty.
+    """
+    stream = request.stream
+    if isinstance(stream, httpx.ByteStream):
+        return True
+    fields = getattr(stream, "fields", None)
+    if fields is None:
+        return False
+    for field in fields:
+        file = getattr(field, "file", None)
+        if file is None or isinstance(file, (str, bytes)):
+            continue
+        seekable = getattr(file, "seekable", None)
+        if seekable is None or not seekable():
+            return False
+    return True
+
+
+def proxy_urls(proxy: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Map httpx mount patterns to proxy URLs (None means connect directly).
+
+    An explicit proxy applies to every request. Otherwise this mirrors what
+    httpx does for clients without a custom transport: HTTP_PROXY, HTTPS_PROXY,
+    ALL_PROXY and NO_PROXY are read from the environment.
+    """
+    if proxy is not None:
+        return {"all://": proxy}
+
+    # getproxies() also reads non-HTTP variables (e.g. FTP_PROXY); only the
+    # schemes httpx can route are used
+    environment = getproxies()
+    urls: Dict[str, Optional[str]] = {}
+    for scheme in ("http", "https", "all"):
+        url = environment.get(scheme)
+        if url:
+            urls[f"{scheme}://"] = url if "://" in url else f"http://{url}"
+
+    # NO_PROXY follows curl: "*" disables proxies, ".example.com" matches
+    # subdomains only, "example.com" matches the domain and its subdomains
+    for host in (host.strip() for host in environment.get("no", "").split(",")):
+        if host == "*":
+            return {}
+        if not host:
+            continue
+        if "://" in host:
+            urls[host] = None
+        elif host.lower() == "localhost" or _is_ipv4(host):
+            urls[f"all://{host}"] = None
+        elif _is_ipv6(host):
+            urls[f"all://[{host}]"] = None
+        else:
+            urls[f"all://*{host}"] = None
+    return urls
+
+
+def _is_ipv4(host: str) -> bool:
+    try:
+        ipaddress.IPv4Address(host.split("/")[0])
+    except ValueError:
+        return False
+    return True
+
+
+def _is_ipv6(host: str) -> bool:
+    try:
+        ipaddress.IPv6Address(host.split("/")[0])
+    except ValueError:
+        return False
+    return True
+
+
+def check_request_compression(encoding: Optional[str]) -> None:
+    """Validate a request_compression argument."""
+    if encoding is not None and encoding not in COMPRESSED_JSON_HEADERS:
+        raise ValueError(
+            f"Unsupported request_compression: {encoding!r}. Use 'gzip', 'zstd' or None."
+        )
+    if encoding == "zstd" and zstandard is None:
+        raise ImportError(
+            'request_compression="zstd" requires zstandard. '
+            'Install it with: pip install "erised[zstd]"'
+        )
+
+
+def json_body(payload: Any, compression: Optional[str] = None) -> tuple:
+    """Encode payload as a JSON request body, returning (content, headers)."""
+    body = dumps(payload)
+    if compression is None or len(body) < COMPRESSION_MIN_SIZE:
+        return body, JSON_HEADERS
+    if compression == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    else:
+        body = gzip.compress(body, compresslevel=6)
+    return body, COMPRESSED_JSON_HEADERS[compression]
+
+
+def client_identity(api_url: str, api_key: str) -> bytes:
+    """Key for the server and tenant a client talks to, without holding the API key itself."""
+    return hashlib.blake2b(f"{api_url}\0{api_key}".encode(), digest_size=16).digest()
+
+
+class ResponseCache:
+    """
+    In-process LRU of raw API response bodies with a per-entry TTL.
+
+    Keys include a generation counter that is bumped whenever memories are added
+    or deleted, so responses fetched before a write are never served after it.
+    A maxsize of 0 disables caching.
+
+    Also used, with an infinite TTL and no invalidation, to map upload content
+    hashes to memory IDs.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, *parts: Any) -> bytes:
+        try:
+            raw = dumps([self.generation, *parts], sort_keys=True)
+        except TypeError:
+            # Dicts with mixed key types cannot be sorted; an order-sensitive
+            # key only costs the occasional cache miss
+            raw = dumps([self.generation, *parts])
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        if not self.maxsize:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: bytes, value: Any) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def discard_value(self, value: Any) -> None:
+        with self._lock:
+            for key in [key for key, (_, v) in self._entries.items() if v == value]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def image_source(image: Union[str, Path, bytes, BinaryIO]) -> tuple:
+    """
+    Resolve an add() image argument to (filename, source).
+
+    source is a Path for files on disk, so callers can decide how to open them,
+    otherwise the bytes or file-like object that was passed in.
+    """
+    if isinstance(image, (str, Path)):
+        path = Path(image)
+        if not path.exists():
+            raise FileNotFoundError(f"Image file not found: {path}")
+        return path.name, path
+    if isinstance(image, bytes):
+        return "image.png", image
+    if hasattr(image, "read"):
+        filename = getattr(image, "name", "image.png")
+        if isinstance(filename, str) and "/" in filename:
+            filename = filename.split("/")[-1]
+        return filename, image
+    raise TypeError(f"Invalid image type: {type(image)}")
+
+
+def image_digest(image: Union[bytes, BinaryIO]) -> Optional[bytes]:
+    """
+    SHA-256 of an image's content.
+
+    Streams are hashed from the start and rewound. Returns None for streams that
+    cannot be rewound, since hashing them would consume the upload.
+    """
+    if isinstance(image, bytes):
+        return hashlib.sha256(image).digest()
+    try:
+        position = image.tell()
+        # Some file-likes return None from seek(), so ask tell() for the size
+        image.seek(0, os.SEEK_END)
+        size = image.tell()
+        image.seek(0)
+        # file_digest() fails for objects without readinto() and readable()
+        if (
+            hasattr(hashlib, "file_digest")
+            and hasattr(image, "readinto")
+            and hasattr(image, "readable")
+        ):
+            digest = hashlib.file_digest(image, "sha256").digest()
+        else:
+            digest = _sha256_stream(image, size)
+        image.seek(position)
+        return digest
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _sha256_stream(stream: BinaryIO, size: int) -> bytes:
+    """
+    Hash a stream without allocating a new bytes object per chunk.
+
+    Stands in for hashlib.file_digest on Python < 3.11: reads into one buffer
+    sized to the stream (at most HASH_BUFFER_SIZE) via readinto().
+    """
+    sha256 = hashlib.sha256()
+    if not hasattr(stream, "readinto"):
+        for chunk in iter(lambda: stream.read(HASH_BUFFER_SIZE), b""):
+            sha256.update(chunk)
+        return sha256.digest()
+
+    buffer = bytearray(max(1, min(size, HASH_BUFFER_SIZE)))
+    view = memoryview(buffer)
+    while True:
+        n = stream.readinto(buffer)
+        if not n:
+            break
+        sha256.update(view[:n])
+    return sha256.digest()
+
+
+def image_content_type(image: Union[bytes, BinaryIO]) -> str:
+    """
+    Sniff an image's MIME type from its first bytes without decoding it.
+
+    Seekable streams are read from the start (which is what httpx uploads) and
+    rewound; other streams are peeked at if they support it. Unrecognized data
+    is reported as application/octet-stream.
+    """
+    if isinstance(image, bytes):
+        head = image[:12]
+    else:
+        try:
+            position = image.tell()
+            image.seek(0)
+            head = image.read(12)
+            image.seek(position)
+        except (AttributeError, OSError):
+            if not hasattr(image, "peek"):
+                return "application/octet-stream"
+            head = image.peek(12)[:12]
+
+    if head.startswith(b"\x89PNG"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"GIF8"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+async def arun_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking function in a worker thread."""
+    return await anyio.to_thread.run_sync(func, *args)
+
+
+def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking function (sync counterpart of arun_blocking)."""
+    return func(*args)
+
+
+def load_file(path: Path, stack: ExitStack) -> Union[bytes, BinaryIO]:
+    """
+    Load a file for upload.
+
+    Files up to STREAM_THRESHOLD bytes are read in one go. Larger files are opened
+    (and closed by stack) so httpx streams them from disk in chunks.
+    """
+    if path.stat().st_size <= STREAM_THRESHOLD:
+        return path.read_bytes()
+    return stack.enter_context(open(path, "rb"))
+
+
+async def aload_file(path: Path, stack: ExitStack) -> Union[bytes, BinaryIO]:
+    """Load a file for upload without blocking the event loop."""
+    return await arun_blocking(load_file, path, stack)
+
+
+def check_max_concurrency(max_concurrency: int) -> None:
+    """Validate a max_concurrency argument."""
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency!r}")
+
+
+async def agather_bounded(
+    func: Callable[[Any], Awaitable[Any]],
+    args: Iterable[Any],
+    max_concurrency: int,
+) -> List[Any]:
+    """
+    Await func(arg) for every arg with at most max_concurrency in flight, preserving order.
+
+    Runs on any event loop anyio supports (asyncio, trio). If a call fails, the
+    rest are cancelled and its exception is raised as-is, not as an ExceptionGroup.
+    """
+    check_max_concurrency(max_concurrency)
+    args = list(args)
+    results: List[Any] = [None] * len(args)
+    errors: List[Exception] = []
+    semaphore = anyio.Semaphore(max_concurrency)
+
+    async def run(index, arg):
+        async with semaphore:
+            try:
+                results[index] = await func(arg)
+            except Exception as e:
+                errors.append(e)
+                task_group.cancel_scope.cancel()
+
+    async with anyio.create_task_group() as task_group:
+        for index, arg in enumerate(args):
+            task_group.start_soon(run, index, arg)
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+def gather_bounded(
+    func: Callable[[Any], Any],
+    args: Iterable[Any],
+    max_concurrency: int,
+) -> List[Any]:
+    """Call func(arg) for every arg on up to max_concurrency threads, preserving order."""
+    check_max_concurrency(max_concurrency)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(executor.map(func, args))
@@ -0,0 +1,156 @@
+"""
+Semantic search cache - reuse results for near-duplicate queries.
+
+Usage:
+    from erised import ErisedClient, SemanticCache
+
+    client = ErisedClient(semantic_cache=SemanticCache(threshold=0.92))
+
+    client.search("code editor", user_id="user123")    # hits the API
+    client.search("a code editor", user_id="user123")  # served from the cache
+
+Requires the optional dependencies: pip install "erised[semantic]"
+"""
+
+import threading
+from typing import Any, Optional
+
+
+class SemanticCache:
+    """
+    Cache of search results keyed by query meaning rather than exact text.
+
+    Queries are embedded locally and compared against previously cached queries
+    by cosine similarity. A cached result is reused only when the similarity is
+    at least ``threshold`` and the rest of the search (filters, top_k, score
+    threshold) is identical.
+
+    One cache may be shared by several clients: entries are tagged with the
+    owning client (API URL and key), so results never cross tenants and a
+    write through any client drops the entries of every client that shares
+    its owner.
+
+    Args:
+        model: sentence-transformers model name, or an already loaded model
+            exposing ``encode(text, normalize_embeddings=True)``.
+        threshold: Minimum cosine similarity for a cached query to count as a hit.
+        max_entries: Maximum number of cached queries. The least recently used
+            entry is evicted when full.
+    """
+
+    def __init__(
+        self,
+        model: Any = "all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        max_entries: int = 512,
+    ):
+        try:
+            import numpy as np
+            if isinstance(model, str):
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(model)
+        except ImportError as e:
+            raise ImportError(
+                "SemanticCache requires numpy and sentence-transformers. "
+                'Install them with: pip install "erised[semantic]"'
+            ) from e
+
+        self._np = np
+        self.model = model
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        # Embeddings live in one preallocated matrix so a lookup is a single
+        # matrix-vector product over all cached queries.
+        self._embeddings = None
+        self._scopes: list = []
+        self._results: list = []
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def embed(self, query: str):
+        """Embed a query as a unit-length float32 vector."""
+        embedding = self.model.encode(query, normalize_embeddings=True)
+        return self._np.asarray(embedding, dtype=self._np.float32)
+
+    def lookup(self, embedding, scope: Any, owner: Any = None) -> Optional[Any]:
+        """
+        Return the cached result closest to ``embedding`` within ``scope``.
+
+        Args:
+            embedding: Query embedding returned by embed()
+            scope: Key for everything but the query text; only entries with an
+                equal scope are considered.
+            owner: Key identifying who stored the entry (the clients pass their
+                API URL and key); only entries with an equal owner are considered.
+
+        Returns:
+            The value passed to store() for the closest query (the clients store
+            raw response bodies), or None if nothing is similar enough
+        """
+        np = self._np
+        with self._lock:
+            size = len(self._results)
+            if not size:
+                return None
+
+            scores = self._embeddings[:size] @ embedding
+            scope = (owner, scope)
+            mask = np.fromiter((s == scope for s in self._scopes), dtype=bool, count=size)
+            scores[~mask] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._results[best]
+
+    def store(self, embedding, scope: Any, result: Any, owner: Any = None) -> None:
+        """Cache ``result`` for the query ``embedding`` within ``scope`` and ``owner``."""
+        np = self._np
+        if not self.max_entries:
+            return
+        scope = (owner, scope)
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.empty((self.max_entries, embedding.shape[0]), dtype=np.float32)
+
+            size = len(self._results)
+            if size < self.max_entries:
+                index = size
+                self._scopes.append(scope)
+                self._results.append(result)
+            else:
+                index = int(np.argmin(self._last_used))
+                self._scopes[index] = scope
+                self._results[index] = result
+
+            self._embeddings[index] = embedding
+            self._clock += 1
+            self._last_used[index] = self._clock
+
+    def discard(self, owner: Any) -> None:
+        """Drop every entry stored by ``owner``, e.g. after it added or deleted memories."""
+        with self._lock:
+            keep = [i for i, (o, _) in enumerate(self._scopes) if o != owner]
+            if len(keep) == len(self._scopes):
+                return
+            count = len(keep)
+            if count:
+                self._embeddings[:count] = self._embeddings[keep]
+            self._last_used[:count] = self._last_used[keep]
+            self._last_used[count:] = 0
+            self._scopes[:] = [self._scopes[i] for i in keep]
+            self._results[:] = [self._results[i] for i in keep]
+
+    def clear(self) -> None:
+        """Drop all cached queries and results."""
+        with self._lock:
+            self._scopes.clear()
+            self._results.clear()
+            self._last_used[:] = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
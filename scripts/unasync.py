@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Generate the sync client in erised/_sync from the async source in erised/_async.
+
+Usage:
+    python scripts/unasync.py          # regenerate erised/_sync
+    python scripts/unasync.py --check  # exit non-zero if erised/_sync is stale
+"""
+
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "erised" / "_async"
+TARGET_DIR = ROOT / "erised" / "_sync"
+
+HEADER = "# Generated from erised/_async/{name} by scripts/unasync.py. Do not edit.\n\n"
+
+# Applied in order to every line of the async source
+SUBS = [
+    (r"\basync def\b", "def"),
+    (r"\basync with\b", "with"),
+    (r"\basync for\b", "for"),
+    (r"\bawait ", ""),
+    (r"\bimport anyio\b", "import time"),
+    (r"\banyio\.sleep\b", "time.sleep"),
+    (r"\ban async context manager\b", "a context manager"),
+    (r"\bAsync client\b", "Client"),
+    (r"\bAsyncErisedClient\b", "ErisedClient"),
+    (r"\bAsyncClient\b", "Client"),
+    (r"\bAsyncHTTPTransport\b", "HTTPTransport"),
+    (r"\bAsyncRetryTransport\b", "RetryTransport"),
+    (r"\bhandle_async_request\b", "handle_request"),
+    (r"\bAsyncIterator\b", "Iterator"),
+    (r"\b__aenter__\b", "__enter__"),
+    (r"\b__aexit__\b", "__exit__"),
+    (r"\baclose\b", "close"),
+    (r"\baiter_bytes\b", "iter_bytes"),
+    (r"\bagather_bounded\b", "gather_bounded"),
+    (r"\baload_file\b", "load_file"),
+    (r"\barun_blocking\b", "run_blocking"),
+]
+COMPILED_SUBS = [(re.compile(pattern), repl) for pattern, repl in SUBS]
+
+
+def unasync_source(source: str) -> str:
+    lines = []
+    for line in source.splitlines(keepends=True):
+        for regex, repl in COMPILED_SUBS:
+            line = regex.sub(repl, line)
+        lines.append(line)
+    return "".join(lines)
+
+
+def generate(path: Path) -> str:
+    source = path.read_text()
+    if not source:
+        return source
+    return HEADER.format(name=path.name) + unasync_source(source)
+
+
+def main(argv: list) -> int:
+    check = "--check" in argv
+    stale = []
+
+    for source_path in sorted(SOURCE_DIR.glob("*.py")):
+        target_path = TARGET_DIR / source_path.name
+        expected = generate(source_path)
+        current = target_path.read_text() if target_path.exists() else None
+        if current == expected:
+            continue
+        if check:
+            stale.append(target_path)
+        else:
+            target_path.write_text(expected)
+            print(f"Wrote {target_path.relative_to(ROOT)}")
+
+    if stale:
+        for path in stale:
+            print(f"{path.relative_to(ROOT)} is out of date; run python scripts/unasync.py")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))